@@ -47,6 +47,12 @@ class LeadsDatabase:
         except sqlite3.OperationalError:
             # Column likely already exists
             pass
+        
+        # Lookups and deletes by phone number use this instead of scanning the table
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_phone
+            ON conversations (customer_phone, business_id)
+        """)
             
         self.conn.commit()
     
@@ -1,29 +1,166 @@
 # Install required packages:
 
 
-import whisper
 import os
+import csv
 import json
-import pandas as pd
 from pydub import AudioSegment
-from pydub.silence import split_on_silence
 import re
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from langdetect import detect, DetectorFactory
 
 import logging
 
-# Set seed for consistent language detection
-DetectorFactory.seed = 0
+# Prefer faster-whisper (CTranslate2 runtime, int8 weights); fall back to openai-whisper
+try:
+    from faster_whisper import WhisperModel
+    import ctranslate2
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    import whisper
+    import torch
+    FASTER_WHISPER_AVAILABLE = False
+
+    # Allow TF32 matmuls for any fp32 work left on Ampere+ GPUs
+    torch.set_float32_matmul_precision("high")
+
+# Faster JSON serialization for large training sets (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Prefer FastText-based language ID (C++); fall back to langdetect's pure-Python model.
+# fast-langdetect 1.0 changed detect() to return ranked candidates, so older releases are skipped.
+try:
+    from importlib.metadata import version
+    from fast_langdetect import detect as ft_detect, FastLangdetectError
+    FAST_LANGDETECT_AVAILABLE = int(version("fast-langdetect").split(".")[0]) >= 1
+except ImportError:
+    FAST_LANGDETECT_AVAILABLE = False
+
+if FAST_LANGDETECT_AVAILABLE:
+    LANGUAGE_DETECTION_ERRORS = (FastLangdetectError,)
+else:
+    from langdetect import detect, DetectorFactory
+    from langdetect.lang_detect_exception import LangDetectException
+    LANGUAGE_DETECTION_ERRORS = (LangDetectException,)
+
+    # Set seed for consistent language detection
+    DetectorFactory.seed = 0
+
+# Map detected language codes to our supported languages
+LANGUAGE_NAMES = {
+    'en': 'english',
+    'hi': 'hindi',
+    'kn': 'kannada'
+}
+
+# Whisper language probability above which langdetect is skipped
+WHISPER_LANGUAGE_CONFIDENCE = 0.9
+
+# Formal greetings often indicate business, in any language
+BUSINESS_GREETINGS = ['welcome', 'calling', 'help', 'swagat', 'sahaya']
+
+# Sample rate Whisper expects, and the length of the audio window it decodes in one pass
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_WINDOW_MS = 30000
+
+@lru_cache(maxsize=4096)
+def _detect_language(text):
+    """Detect the language of the given text, memoized since short phrases repeat across calls"""
+    try:
+        if FAST_LANGDETECT_AVAILABLE:
+            # Returns candidates best first; the lite model keeps memory low
+            detected_lang = ft_detect(text, model="lite", k=1)[0]["lang"]
+        else:
+            detected_lang = detect(text)
+        return LANGUAGE_NAMES.get(detected_lang, 'english')  # Default to English
+    except LANGUAGE_DETECTION_ERRORS:
+        # If detection fails, try to identify based on script/patterns
+        # Code points as one NumPy array, so each script check is a vectorized scan
+        code_points = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        if np.any((code_points >= 0x0900) & (code_points <= 0x097F)):  # Devanagari
+            return 'hindi'
+        elif np.any((code_points >= 0x0C80) & (code_points <= 0x0CFF)):  # Kannada
+            return 'kannada'
+        else:
+            return 'english'
+
+
+def _detect_nonsilent(samples, sample_rate, min_silence_len, silence_thresh):
+    """NumPy equivalent of pydub.silence.detect_nonsilent for mono 16-bit samples
+
+    Returns [start_ms, end_ms] ranges outside every silence of at least min_silence_len ms
+    quieter than silence_thresh dBFS, found in one vectorized pass instead of per-ms slices.
+    """
+    frame = sample_rate // 1000
+    n_ms = len(samples) // frame
+    if n_ms < min_silence_len:
+        return [[0, n_ms]]
+
+    # Energy of each millisecond, then the RMS of every window via a running sum
+    energy = np.square(samples[:n_ms * frame], dtype=np.float64).reshape(n_ms, frame).sum(axis=1)
+    running = np.concatenate(([0.0], np.cumsum(energy)))
+    window_rms = np.floor(np.sqrt((running[min_silence_len:] - running[:-min_silence_len]) / (min_silence_len * frame)))
+    silent_starts = np.flatnonzero(window_rms <= 10 ** (silence_thresh / 20) * 32768)
+
+    # A millisecond is silent if any silent window covers it
+    coverage = np.zeros(n_ms + 1, dtype=np.int32)
+    coverage[silent_starts] += 1
+    coverage[silent_starts + min_silence_len] -= 1
+    nonsilent = np.cumsum(coverage[:-1]) == 0
+
+    edges = np.diff(np.concatenate(([0], nonsilent.view(np.int8), [0])))
+    return [[int(start), int(end)] for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))]
+
+
+def _fuse_patterns(named_patterns):
+    """Combine {group_name: regex} into one case-insensitive regex for _match_pattern_names
+
+    Every pattern sits in an optional lookahead behind a guard that any of them matches,
+    so a single scan records all patterns matching at each position, overlaps included.
+    """
+    guard = "|".join(f"(?:{pattern})" for pattern in named_patterns.values())
+    lookaheads = "".join(f"(?:(?=(?P<{name}>{pattern})))?" for name, pattern in named_patterns.items())
+    return re.compile(f"(?=(?:{guard})){lookaheads}", re.IGNORECASE)
+
+
+def _match_pattern_names(fused, text):
+    """Return the group names of the fused patterns found anywhere in text"""
+    names = set()
+    for match in fused.finditer(text):
+        names.update(name for name, value in match.groupdict().items() if value is not None)
+    return names
+
 
 class MultilingualVoiceDataProcessor:
-    def __init__(self, whisper_model_size="base"):
+    def __init__(self, whisper_model_size="base", num_workers=2):
         # Load Whisper model for transcription (supports multilingual)
         print(f"Loading Whisper model ({whisper_model_size})...")
-        self.whisper_model = whisper.load_model(whisper_model_size)
-
-        
+        if FASTER_WHISPER_AVAILABLE:
+            # int8 weights, with fp16 activations when a GPU is present; with several GPUs
+            # CTranslate2 keeps a replica on each and spreads concurrent requests across them
+            gpu_count = ctranslate2.get_cuda_device_count()
+            device = "cuda" if gpu_count > 0 else "cpu"
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            self.whisper_model = WhisperModel(
+                whisper_model_size, device=device, device_index=list(range(max(gpu_count, 1))),
+                compute_type=compute_type, num_workers=num_workers
+            )
+        else:
+            # Load onto the GPU explicitly when there is one; fp16 is used there
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.whisper_model = whisper.load_model(whisper_model_size, device=device)
+
+        # One model is shared by every file; openai-whisper isn't safe to run concurrently
+        self.num_workers = num_workers
+        self._model_lock = threading.Lock()
 
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -36,9 +173,39 @@ class MultilingualVoiceDataProcessor:
         # Language-specific patterns for speaker identification
         self.language_patterns = self._initialize_language_patterns()
 
+        # Multilingual intent patterns
+        self.intent_patterns = self._initialize_intent_patterns()
+
+        # One fused regex per language, so each text is scanned once instead of per pattern.
+        # The cross-language cues ride along: a question mark counts once towards the
+        # customer and any formal greeting once towards the business.
+        speaker_regexes = {
+            language: _fuse_patterns({
+                **{f"c{i}": p.pattern for i, p in enumerate(patterns['customer_patterns'])},
+                **{f"b{i}": p.pattern for i, p in enumerate(patterns['business_patterns'])},
+                "c_question": r"\?",
+                "b_greeting": "|".join(BUSINESS_GREETINGS)
+            })
+            for language, patterns in self.language_patterns.items()
+        }
+        intent_languages = {language for lang_patterns in self.intent_patterns.values() for language in lang_patterns}
+        intent_regexes = {
+            language: _fuse_patterns({
+                f"{intent}_{i}": p.pattern
+                for intent, lang_patterns in self.intent_patterns.items()
+                for i, p in enumerate(lang_patterns.get(language, lang_patterns.get("english", [])))
+            })
+            for language in intent_languages
+        }
+
+        # Unknown languages resolve to the English regex once and are cached under their own
+        # key, so lookups in the scoring loops are a single subscript
+        self._speaker_regexes = defaultdict(lambda: speaker_regexes['english'], speaker_regexes)
+        self._intent_regexes = defaultdict(lambda: intent_regexes['english'], intent_regexes)
+
     def _initialize_language_patterns(self):
         """Initialize language-specific patterns for speaker identification"""
-        return {
+        patterns = {
             'english': {
                 'customer_patterns': [
                     r'\b(are you|do you|can i|what time|how long|is there)\b',
@@ -84,133 +251,267 @@ class MultilingualVoiceDataProcessor:
             }
         }
 
+        # Compile once; matching is case-insensitive so segments needn't be lowercased
+        return {
+            language: {kind: [re.compile(p, re.IGNORECASE) for p in kind_patterns]
+                       for kind, kind_patterns in language_patterns.items()}
+            for language, language_patterns in patterns.items()
+        }
+
+    def _initialize_intent_patterns(self):
+        """Initialize multilingual intent patterns"""
+        intent_patterns = {
+            "hours": {
+                "english": [r"\b(hours|open|close|what time|timing)\b"],
+                "hindi": [r"\b(samay|khula|band|kab|ghante)\b"],
+                "kannada": [r"\b(samaya|khali|muchkondu|yaavaga|gante)\b"]
+            },
+            "availability": {
+                "english": [r"\b(table|available|wait|busy|reservation|book)\b"],
+                "hindi": [r"\b(table|jagah|intezaar|vyast|booking)\b"],
+                "kannada": [r"\b(table|stala|kaayuva|busy|booking)\b"]
+            },
+            "menu": {
+                "english": [r"\b(menu|food|eat|dish|special|cuisine)\b"],
+                "hindi": [r"\b(menu|khana|bhojan|dish|vishesh)\b"],
+                "kannada": [r"\b(menu|anna|oota|dish|visheshha)\b"]
+            },
+            "location": {
+                "english": [r"\b(where|address|location|directions|find)\b"],
+                "hindi": [r"\b(kahan|pata|jagah|raasta|dhundna)\b"],
+                "kannada": [r"\b(elli|patta|stala|daari|kandu)\b"]
+            },
+            "contact": {
+                "english": [r"\b(phone|number|call|contact|reach)\b"],
+                "hindi": [r"\b(phone|number|call|sampark|pahunchna)\b"],
+                "kannada": [r"\b(phone|number|call|sampark|seralu)\b"]
+            },
+            "pricing": {
+                "english": [r"\b(price|cost|expensive|cheap|much|rate)\b"],
+                "hindi": [r"\b(daam|kimat|mehnga|sasta|kitna)\b"],
+                "kannada": [r"\b(bele|kimat|jasti|kammi|eshtu)\b"]
+            },
+            "services": {
+                "english": [r"\b(delivery|takeout|catering|party|service)\b"],
+                "hindi": [r"\b(delivery|ghar|catering|party|seva)\b"],
+                "kannada": [r"\b(delivery|mane|catering|party|seva)\b"]
+            }
+        }
+
+        return {
+            intent: {language: [re.compile(p, re.IGNORECASE) for p in patterns]
+                     for language, patterns in lang_patterns.items()}
+            for intent, lang_patterns in intent_patterns.items()
+        }
+
     def detect_language(self, text):
         """Detect the language of the given text"""
-        try:
-            detected_lang = detect(text)
-            # Map detected language codes to our supported languages
-            lang_mapping = {
-                'en': 'english',
-                'hi': 'hindi',
-                'kn': 'kannada'
-            }
-            return lang_mapping.get(detected_lang, 'english')  # Default to English
-        except:
-            # If detection fails, try to identify based on script/patterns
-            if any(ord(char) >= 0x0900 and ord(char) <= 0x097F for char in text):  # Devanagari
-                return 'hindi'
-            elif any(ord(char) >= 0x0C80 and ord(char) <= 0x0CFF for char in text):  # Kannada
-                return 'kannada'
-            else:
-                return 'english'
+        return _detect_language(text)
 
-    def preprocess_audio(self, audio_path, output_dir="processed_audio"):
-        """Clean and prepare audio files for better transcription"""
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Load audio
+    def preprocess_audio(self, audio_path):
+        """Clean and prepare audio files for better transcription
+
+        Returns the chunks as float32 arrays at 16 kHz, ready to pass straight to Whisper.
+        """
+        # Load audio as 16 kHz mono 16-bit, the format Whisper consumes
         audio = AudioSegment.from_file(audio_path)
+        audio = audio.set_frame_rate(WHISPER_SAMPLE_RATE).set_channels(1).set_sample_width(2)
         
         # Normalize audio
         audio = audio.normalize()
         
         # Remove silence and split into segments
-        chunks = split_on_silence(
-            audio,
+        samples = np.array(audio.get_array_of_samples(), dtype=np.int16)
+        ranges = _detect_nonsilent(
+            samples,
+            WHISPER_SAMPLE_RATE,
             min_silence_len=1000,  # 1 second
-            silence_thresh=audio.dBFS-14,
-            keep_silence=500
+            silence_thresh=audio.dBFS-14
         )
         
+        # Keep 500ms of silence around each segment, splitting any overlap evenly
+        keep_silence = 500
+        ranges = [[start - keep_silence, end + keep_silence] for start, end in ranges]
+        for previous, current in zip(ranges, ranges[1:]):
+            if current[0] < previous[1]:
+                previous[1] = current[0] = (previous[1] + current[0]) // 2
+        
+        samples = samples.astype(np.float32) / 32768.0
+        frame = WHISPER_SAMPLE_RATE // 1000
+        duration_ms = len(samples) // frame
+        
         processed_chunks = []
-        for i, chunk in enumerate(chunks):
-            if len(chunk) > 2000:  # Only keep chunks longer than 2 seconds
-                chunk_path = f"{output_dir}/chunk_{i}.wav"
-                chunk.export(chunk_path, format="wav")
-                processed_chunks.append(chunk_path)
+        for start, end in ranges:
+            start, end = max(start, 0), min(end, duration_ms)
+            if end - start > 2000:  # Only keep chunks longer than 2 seconds
+                # Whisper decodes 30 second windows, so longer chunks are split into pieces
+                for piece_start in range(start, end, WHISPER_WINDOW_MS):
+                    piece_end = min(piece_start + WHISPER_WINDOW_MS, end)
+                    processed_chunks.append(samples[piece_start * frame:piece_end * frame])
         
         return processed_chunks
+
+    def transcribe_chunks(self, chunks, batch_size=16):
+        """Transcribe 16 kHz audio arrays of at most 30 seconds with batched Whisper decoding"""
+        model = self.whisper_model
+        if FASTER_WHISPER_AVAILABLE:
+            # CTranslate2 schedules its own work, so chunks go through the model directly
+            return [
+                "".join(segment.text for segment in model.transcribe(chunk, beam_size=1)[0])
+                for chunk in chunks
+            ]
+
+        options = whisper.DecodingOptions(without_timestamps=True, fp16=model.device.type == "cuda")
+
+        texts = []
+        for start in range(0, len(chunks), batch_size):
+            # Pad every chunk to the 30 second window and decode the whole batch at once
+            mel_batch = torch.stack([
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(chunk),
+                    n_mels=model.dims.n_mels
+                )
+                for chunk in chunks[start:start + batch_size]
+            ]).to(model.device)
+
+            with self._model_lock:
+                results = whisper.decode(model, mel_batch, options)
+            texts.extend(result.text for result in results)
+
+        return texts
     
-    def transcribe_conversation(self, audio_path):
-        """Transcribe full conversation with multilingual support"""
-        self.logger.info(f"Transcribing conversation: {audio_path}")
+    def transcribe_conversation(self, audio_path, use_silence_chunks=False):
+        """Transcribe full conversation with multilingual support
 
-        # First transcribe the entire conversation
-        result = self.whisper_model.transcribe(audio_path)
+        Segments come from the single Whisper pass; use_silence_chunks=True instead
+        splits the audio on silence and transcribes each chunk separately.
+        """
+        self.logger.info(f"Transcribing conversation: {audio_path}")
 
-        # Detect primary language of the conversation
-        primary_language = self.detect_language(result["text"])
+        # Transcribe the entire conversation once; its timestamped segments are the chunks
+        if FASTER_WHISPER_AVAILABLE:
+            # The built-in VAD filter takes the place of preprocess_audio's silence splitting
+            segments, info = self.whisper_model.transcribe(audio_path, vad_filter=True, beam_size=1)
+            segments = [
+                {"text": segment.text, "start": segment.start, "end": segment.end}
+                for segment in segments
+            ]
+            full_transcript = "".join(segment["text"] for segment in segments)
+            whisper_language, language_probability = info.language, info.language_probability
+        else:
+            model = self.whisper_model
+            audio = whisper.load_audio(audio_path)
+            with self._model_lock:
+                # Detect the language up front (as transcribe would) to get its probability,
+                # then pass it in so transcribe doesn't detect it a second time
+                if model.is_multilingual:
+                    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=model.dims.n_mels)
+                    _, language_probs = model.detect_language(mel.to(model.device))
+                    whisper_language = max(language_probs, key=language_probs.get)
+                    language_probability = language_probs[whisper_language]
+                else:
+                    # English-only models (*.en) can't detect languages
+                    whisper_language, language_probability = "en", 1.0
+
+                result = model.transcribe(
+                    audio, language=whisper_language, word_timestamps=True, fp16=model.device.type == "cuda"
+                )
+            segments = result["segments"]
+            full_transcript = result["text"]
+
+        # Detect primary language of the conversation; Whisper's own answer is used
+        # when it is confident, so langdetect only runs on uncertain recordings
+        if language_probability > WHISPER_LANGUAGE_CONFIDENCE:
+            primary_language = LANGUAGE_NAMES.get(whisper_language, 'english')
+        else:
+            primary_language = self.detect_language(full_transcript)
         self.logger.info(f"Detected primary language: {primary_language}")
 
-        # Split into chunks and try to identify speakers
-        chunks = self.preprocess_audio(audio_path)
-
         conversation = {
-            "full_transcript": result["text"],
+            "full_transcript": full_transcript,
             "primary_language": primary_language,
             "segments": [],
             "audio_path": audio_path,
             "timestamp": datetime.now().isoformat()
         }
 
-        for chunk_path in chunks:
-            chunk_result = self.whisper_model.transcribe(chunk_path)
-            chunk_language = self.detect_language(chunk_result["text"])
-
-            conversation["segments"].append({
-                "text": chunk_result["text"],
-                "language": chunk_language,
-                "audio_file": chunk_path,
-                "duration": len(AudioSegment.from_file(chunk_path)) / 1000
-            })
+        if use_silence_chunks:
+            # Split into chunks and try to identify speakers
+            chunks = self.preprocess_audio(audio_path)
+            chunk_texts = self.transcribe_chunks(chunks)
+
+            for chunk, chunk_text in zip(chunks, chunk_texts):
+                conversation["segments"].append({
+                    "text": chunk_text,
+                    "language": self.detect_language(chunk_text),
+                    "audio_file": audio_path,
+                    "duration": len(chunk) / WHISPER_SAMPLE_RATE
+                })
+        else:
+            for segment in segments:
+                conversation["segments"].append({
+                    "text": segment["text"],
+                    "language": self.detect_language(segment["text"]),
+                    "audio_file": audio_path,
+                    "start": segment["start"],
+                    "end": segment["end"],
+                    "duration": segment["end"] - segment["start"]
+                })
 
         return conversation
     
     def identify_speakers(self, conversation):
         """Multilingual speaker identification based on patterns"""
         segments = conversation["segments"]
-        labeled_segments = []
         primary_language = conversation.get("primary_language", "english")
 
-        for segment in segments:
-            text = segment["text"].lower().strip()
-            segment_language = segment.get("language", primary_language)
+        # Column layout: one array per field, so each language's segments are scored together
+        texts = [segment["text"].strip() for segment in segments]
+        languages = np.array([segment.get("language", primary_language) for segment in segments], dtype=object)
+        customer_scores = np.zeros(len(segments), dtype=np.int64)
+        business_scores = np.zeros(len(segments), dtype=np.int64)
 
+        # Bound once as locals for the loop below
+        speaker_regexes = self._speaker_regexes
+        match_names = _match_pattern_names
+
+        for segment_language in set(languages.tolist()):
             # Get language-specific patterns
-            patterns = self.language_patterns.get(segment_language, self.language_patterns['english'])
-            customer_patterns = patterns['customer_patterns']
-            business_patterns = patterns['business_patterns']
-
-            # Score each segment
-            customer_score = sum(1 for pattern in customer_patterns if re.search(pattern, text))
-            business_score = sum(1 for pattern in business_patterns if re.search(pattern, text))
-
-            # Additional scoring based on common patterns across languages
-            # Questions typically indicate customers
-            if '?' in text or text.endswith('?'):
-                customer_score += 1
-
-            # Formal greetings often indicate business
-            if any(greeting in text for greeting in ['welcome', 'calling', 'help', 'swagat', 'sahaya']):
-                business_score += 1
-
-            # Assign speaker
-            if business_score > customer_score:
-                speaker = "business_owner"
-            elif customer_score > 0:
-                speaker = "customer"
-            else:
-                speaker = "unknown"
+            speaker_regex = speaker_regexes[segment_language]
+            indices = np.flatnonzero(languages == segment_language)
+
+            # Score each segment by the number of distinct patterns it matches: a segment x
+            # pattern hit matrix times per-pattern (customer, business) weights, one product
+            # for the whole language group
+            columns = {name: column for column, name in enumerate(speaker_regex.groupindex)}
+            weights = np.array([[name[0] == 'c', name[0] == 'b'] for name in columns], dtype=np.int64)
+            hits = np.zeros((len(indices), len(columns)), dtype=np.int64)
+            for row, i in enumerate(indices):
+                for name in match_names(speaker_regex, texts[i]):
+                    hits[row, columns[name]] = 1
+
+            scores = hits @ weights
+            customer_scores[indices] = scores[:, 0]
+            business_scores[indices] = scores[:, 1]
+
+        # Assign speakers
+        speakers = np.where(
+            business_scores > customer_scores, "business_owner",
+            np.where(customer_scores > 0, "customer", "unknown")
+        )
 
-            labeled_segments.append({
+        conversation["labeled_segments"] = [
+            {
                 **segment,
                 "speaker": speaker,
                 "customer_score": customer_score,
                 "business_score": business_score,
                 "segment_language": segment_language
-            })
-
-        conversation["labeled_segments"] = labeled_segments
+            }
+            for segment, speaker, customer_score, business_score, segment_language in zip(
+                segments, speakers.tolist(), customer_scores.tolist(), business_scores.tolist(), languages.tolist()
+            )
+        ]
         return conversation
     
     def extract_qa_pairs(self, conversation):
@@ -219,86 +520,62 @@ class MultilingualVoiceDataProcessor:
         qa_pairs = []
         primary_language = conversation.get("primary_language", "english")
 
-        for i, segment in enumerate(segments):
-            if segment["speaker"] == "customer":
-                question = segment["text"]
-                question_language = segment.get("segment_language", primary_language)
-
-                # Look for the next business owner response
-                for j in range(i + 1, len(segments)):
-                    if segments[j]["speaker"] == "business_owner":
-                        answer = segments[j]["text"]
-                        answer_language = segments[j].get("segment_language", primary_language)
-
-                        qa_pairs.append({
-                            "question": question.strip(),
-                            "answer": answer.strip(),
-                            "question_language": question_language,
-                            "answer_language": answer_language,
-                            "primary_language": primary_language,
-                            "context": {
-                                "conversation_id": conversation.get("audio_path", ""),
-                                "timestamp": conversation.get("timestamp", ""),
-                                "question_audio": segment.get("audio_file", ""),
-                                "answer_audio": segments[j].get("audio_file", "")
-                            }
-                        })
-                        break
+        # Each customer segment is answered by the next business owner segment after it
+        speakers = np.array([segment["speaker"] for segment in segments], dtype=object)
+        business_indices = np.flatnonzero(speakers == "business_owner")
+        customer_indices = np.flatnonzero(speakers == "customer")
+        answer_positions = np.searchsorted(business_indices, customer_indices, side='right')
+
+        # Per-conversation values, looked up once rather than for every pair
+        business_count = len(business_indices)
+        conversation_id = conversation.get("audio_path", "")
+        timestamp = conversation.get("timestamp", "")
+
+        for i, position in zip(customer_indices.tolist(), answer_positions.tolist()):
+            if position == business_count:
+                # No business owner speaks after this point
+                break
+
+            segment = segments[i]
+            answer_segment = segments[business_indices[position]]
+
+            qa_pairs.append({
+                "question": segment["text"].strip(),
+                "answer": answer_segment["text"].strip(),
+                "question_language": segment.get("segment_language", primary_language),
+                "answer_language": answer_segment.get("segment_language", primary_language),
+                "primary_language": primary_language,
+                "context": {
+                    "conversation_id": conversation_id,
+                    "timestamp": timestamp,
+                    "question_audio": segment.get("audio_file", ""),
+                    "answer_audio": answer_segment.get("audio_file", "")
+                }
+            })
 
         return qa_pairs
     
     def categorize_intents(self, qa_pairs):
         """Categorize questions by intent across multiple languages"""
-        # Multilingual intent patterns
-        intent_patterns = {
-            "hours": {
-                "english": [r"\b(hours|open|close|what time|timing)\b"],
-                "hindi": [r"\b(samay|khula|band|kab|ghante)\b"],
-                "kannada": [r"\b(samaya|khali|muchkondu|yaavaga|gante)\b"]
-            },
-            "availability": {
-                "english": [r"\b(table|available|wait|busy|reservation|book)\b"],
-                "hindi": [r"\b(table|jagah|intezaar|vyast|booking)\b"],
-                "kannada": [r"\b(table|stala|kaayuva|busy|booking)\b"]
-            },
-            "menu": {
-                "english": [r"\b(menu|food|eat|dish|special|cuisine)\b"],
-                "hindi": [r"\b(menu|khana|bhojan|dish|vishesh)\b"],
-                "kannada": [r"\b(menu|anna|oota|dish|visheshha)\b"]
-            },
-            "location": {
-                "english": [r"\b(where|address|location|directions|find)\b"],
-                "hindi": [r"\b(kahan|pata|jagah|raasta|dhundna)\b"],
-                "kannada": [r"\b(elli|patta|stala|daari|kandu)\b"]
-            },
-            "contact": {
-                "english": [r"\b(phone|number|call|contact|reach)\b"],
-                "hindi": [r"\b(phone|number|call|sampark|pahunchna)\b"],
-                "kannada": [r"\b(phone|number|call|sampark|seralu)\b"]
-            },
-            "pricing": {
-                "english": [r"\b(price|cost|expensive|cheap|much|rate)\b"],
-                "hindi": [r"\b(daam|kimat|mehnga|sasta|kitna)\b"],
-                "kannada": [r"\b(bele|kimat|jasti|kammi|eshtu)\b"]
-            },
-            "services": {
-                "english": [r"\b(delivery|takeout|catering|party|service)\b"],
-                "hindi": [r"\b(delivery|ghar|catering|party|seva)\b"],
-                "kannada": [r"\b(delivery|mane|catering|party|seva)\b"]
-            }
-        }
-
         categorized_pairs = []
 
+        # Bound once as locals for the loop below
+        intent_regexes = self._intent_regexes
+        intent_order = list(self.intent_patterns)
+        match_names = _match_pattern_names
+
         for pair in qa_pairs:
-            question = pair["question"].lower()
+            question = pair["question"]
             question_language = pair.get("question_language", "english")
 
             # Find the best matching intent using language-specific patterns
+            intent_regex = intent_regexes[question_language]
+            matched_intents = [name.rsplit('_', 1)[0] for name in match_names(intent_regex, question)]
+
+            # Scores stay in intent table order so ties resolve as before
             intent_scores = {}
-            for intent, lang_patterns in intent_patterns.items():
-                patterns = lang_patterns.get(question_language, lang_patterns.get("english", []))
-                score = sum(1 for pattern in patterns if re.search(pattern, question))
+            for intent in intent_order:
+                score = matched_intents.count(intent)
                 if score > 0:
                     intent_scores[intent] = score
 
@@ -330,32 +607,38 @@ class MultilingualVoiceDataProcessor:
         
         print(f"Found {len(audio_files)} audio files to process...")
         
-        for i, filename in enumerate(audio_files):
-            print(f"Processing {i+1}/{len(audio_files)}: {filename}")
+        # Transcription runs ahead on the pool while the text stages run here, so one file's
+        # speaker/Q&A/intent processing overlaps the transcription of the files after it
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            futures = [
+                executor.submit(self.transcribe_conversation, os.path.join(audio_directory, filename))
+                for filename in audio_files
+            ]
             
-            try:
-                audio_path = os.path.join(audio_directory, filename)
-                
-                # Transcribe conversation
-                conversation = self.transcribe_conversation(audio_path)
+            for i, (filename, future) in enumerate(zip(audio_files, futures)):
+                print(f"Processing {i+1}/{len(audio_files)}: {filename}")
                 
-                # Identify speakers
-                conversation = self.identify_speakers(conversation)
-                
-                # Extract Q&A pairs
-                qa_pairs = self.extract_qa_pairs(conversation)
-                
-                # Categorize intents
-                qa_pairs = self.categorize_intents(qa_pairs)
-                
-                all_conversations.append(conversation)
-                all_qa_pairs.extend(qa_pairs)
-                
-                print(f"  - Extracted {len(qa_pairs)} Q&A pairs")
-                
-            except Exception as e:
-                print(f"Error processing {filename}: {str(e)}")
-                continue
+                try:
+                    # Transcribe conversation
+                    conversation = future.result()
+                    
+                    # Identify speakers
+                    conversation = self.identify_speakers(conversation)
+                    
+                    # Extract Q&A pairs
+                    qa_pairs = self.extract_qa_pairs(conversation)
+                    
+                    # Categorize intents
+                    qa_pairs = self.categorize_intents(qa_pairs)
+                    
+                    all_conversations.append(conversation)
+                    all_qa_pairs.extend(qa_pairs)
+                    
+                    print(f"  - Extracted {len(qa_pairs)} Q&A pairs")
+                    
+                except Exception as e:
+                    print(f"Error processing {filename}: {str(e)}")
+                    continue
         
         return all_conversations, all_qa_pairs
     
@@ -367,40 +650,45 @@ class MultilingualVoiceDataProcessor:
             "qa_pairs": qa_pairs
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(training_data, f, indent=2)
-        
-        # Also create a simple CSV for easy viewing
-        df = pd.DataFrame([{
-            "question": pair["question"],
-            "answer": pair["answer"],
-            "intent": pair["intent"],
-            "confidence": pair["intent_confidence"]
-        } for pair in qa_pairs])
+        if ORJSON_AVAILABLE:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(training_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(training_data, f, indent=2)
         
-        df.to_csv(output_file.replace('.json', '.csv'), index=False)
+        # Also create a simple CSV for easy viewing, written row by row without a DataFrame
+        with open(output_file.replace('.json', '.csv'), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(["question", "answer", "intent", "confidence"])
+            writer.writerows(
+                (pair["question"], pair["answer"], pair["intent"], pair["intent_confidence"])
+                for pair in qa_pairs
+            )
         
         print(f"Saved {len(qa_pairs)} training pairs to {output_file}")
         return training_data
     
     def analyze_data_quality(self, qa_pairs):
         """Analyze the quality and distribution of extracted data"""
-        # Intent distribution
-        intent_counts = {}
+        # Intent distribution and quality metrics, gathered in a single pass
+        intent_counts = Counter()
+        unique_questions = set()
+        question_length_total = answer_length_total = 0
         for pair in qa_pairs:
-            intent = pair["intent"]
-            intent_counts[intent] = intent_counts.get(intent, 0) + 1
-        
-        # Quality metrics
-        avg_question_length = np.mean([len(pair["question"]) for pair in qa_pairs])
-        avg_answer_length = np.mean([len(pair["answer"]) for pair in qa_pairs])
+            question = pair["question"]
+            intent_counts[pair["intent"]] += 1
+            unique_questions.add(question)
+            question_length_total += len(question)
+            answer_length_total += len(pair["answer"])
         
+        total = len(qa_pairs)
         report = {
-            "total_qa_pairs": len(qa_pairs),
-            "intent_distribution": intent_counts,
-            "avg_question_length": avg_question_length,
-            "avg_answer_length": avg_answer_length,
-            "unique_questions": len(set(pair["question"] for pair in qa_pairs))
+            "total_qa_pairs": total,
+            "intent_distribution": dict(intent_counts),
+            "avg_question_length": question_length_total / total if total else float("nan"),
+            "avg_answer_length": answer_length_total / total if total else float("nan"),
+            "unique_questions": len(unique_questions)
         }
         
         print("\n=== DATA QUALITY REPORT ===")
@@ -410,7 +698,7 @@ class MultilingualVoiceDataProcessor:
         print(f"Avg answer length: {report['avg_answer_length']:.1f} chars")
         print("\nIntent distribution:")
         for intent, count in sorted(intent_counts.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {intent}: {count} ({count/len(qa_pairs)*100:.1f}%)")
+            print(f"  {intent}: {count} ({count/total*100:.1f}%)")
         
         return report
 
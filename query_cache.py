@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Persistent cache for answered queries, so repeated questions skip the Gemini API.
+"""
+
+import sqlite3
+import json
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """Manages a SQLite key/value cache of query results with expiry and LRU eviction
+
+    Cache failures (e.g. a database locked by another worker) are logged and
+    treated as misses, so they never cost the caller an answer.
+    """
+
+    def __init__(self, db_path=".query_cache.db", ttl=86400, max_entries=5000):
+        """Open the cache database and create the table if needed"""
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create cache table if it doesn't exist"""
+        with self._lock:
+            # Cache files from before LRU eviction lack accessed_at; their entries are disposable
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(query_cache)")}
+            if columns and "accessed_at" not in columns:
+                self.conn.execute("DROP TABLE query_cache")
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_query_cache_accessed ON query_cache(accessed_at)"
+            )
+            self.conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key, or None if missing, expired or unreadable"""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT value, expires_at FROM query_cache WHERE key = ?", (key,)
+                ).fetchone()
+
+                if not row:
+                    return None
+
+                if row[1] < now:
+                    self.conn.execute("DELETE FROM query_cache WHERE key = ?", (key,))
+                else:
+                    # Mark as recently used so eviction drops it last
+                    self.conn.execute(
+                        "UPDATE query_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                self.conn.commit()
+
+            return json.loads(row[0]) if row[1] >= now else None
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Query cache read failed, treating as a miss: {e}")
+            return None
+
+    def set(self, key: str, value: Dict, expire: Optional[float] = None):
+        """Store a JSON-serializable result under key, evicting expired and least recently used rows"""
+        now = time.time()
+        expires_at = now + (expire if expire is not None else self.ttl)
+        try:
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO query_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+                )
+                self.conn.execute("DELETE FROM query_cache WHERE expires_at < ?", (now,))
+                self.conn.execute(
+                    """DELETE FROM query_cache WHERE key IN (
+                        SELECT key FROM query_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,)
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Query cache write failed, answer not cached: {e}")
+
+    def close(self):
+        """Close database connection"""
+        self.conn.close()
+
+
+# Singleton instance
+_cache_instance = None
+
+def get_query_cache() -> Optional[QueryCache]:
+    """Get or create query cache instance, or None if the database can't be opened"""
+    global _cache_instance
+    if _cache_instance is None:
+        try:
+            _cache_instance = QueryCache()
+        except sqlite3.Error as e:
+            logger.warning(f"Query cache unavailable, answers won't be cached: {e}")
+            return None
+    return _cache_instance
@@ -7,14 +7,31 @@ Uses transcripts as knowledge base to answer queries in English, Hindi, or Kanna
 import os
 import sys
 import json
+import socket
+import hashlib
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 import logging
 
+import numpy as np
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from query_cache import get_query_cache
+
+# Last model that passed probing, so new processes can skip the probe.
+# One file per API key, since keys and projects differ in which models they can use.
+MODEL_CACHE_DIR = Path.home() / ".cache" / "vani-ai"
+
+# Errors that mean the model itself is unusable for this key (retired, not permitted,
+# or unsupported), as opposed to transient failures; these trigger a re-probe
+MODEL_ERROR_MARKERS = ("404", "NOT_FOUND", "403", "PERMISSION_DENIED", "400", "INVALID_ARGUMENT", "not supported")
+
+# Unix socket of a warm agent started with --daemon
+AGENT_SOCKET_PATH = Path.home() / ".cache" / "vani-ai" / "agent.sock"
+
 try:
     from google import genai
     from google.genai import types
@@ -27,7 +44,23 @@ except ImportError:
 class TranscriptQueryAgent:
     """Agent that uses Gemini to answer queries based on transcribed call recordings"""
     
-    def __init__(self, business_id=None, api_key=None):
+    # Devanagari (U+0900-U+097F) always encodes to UTF-8 with one of these lead byte pairs
+    _DEVANAGARI_UTF8_PREFIXES = (b"\xe0\xa4", b"\xe0\xa5")
+    # Script detection only needs a prefix of the query
+    _LANG_SAMPLE_CHARS = 128
+    
+    # Static preamble of the raw-transcript context
+    _TRANSCRIPT_HEADER = "\n".join([
+        "=== TRANSCRIBED CALL RECORDINGS ===\n",
+        "The following are transcriptions of business call recordings.\n",
+        "Use this information to answer user queries.\n\n",
+    ]) + "\n"
+    
+    # Max characters of raw transcript context sent with each query
+    CONTEXT_CHAR_BUDGET = 32000
+    EMBEDDING_MODEL = "text-embedding-004"
+    
+    def __init__(self, business_id=None, api_key=None, use_cache=True):
         """Initialize the query agent for a specific business"""
         if not GEMINI_AVAILABLE:
             raise ImportError("Google Gemini SDK is required. Install with: pip install google-genai")
@@ -40,6 +73,8 @@ class TranscriptQueryAgent:
         
         self.api_key = api_key
         self.client = genai.Client(api_key=api_key)
+        key_hash = hashlib.blake2b(api_key.encode('utf-8'), digest_size=8).hexdigest()
+        self.model_cache_path = MODEL_CACHE_DIR / f"model-{key_hash}.json"
         
         self.business_id = business_id
         if business_id:
@@ -90,6 +125,13 @@ class TranscriptQueryAgent:
         
         # Cache for context to avoid rebuilding every time
         self.cached_context = None
+        self._context_hash = None
+        self._transcript_embeddings = None
+        self._prompt_template = None
+        self._prompt_prefix = None
+        
+        # Persistent cache of answers keyed on (context, query)
+        self.query_cache = get_query_cache() if use_cache else None
 
     def reload(self):
         """Reload configuration, KB, and transcripts (clears cache)"""
@@ -120,6 +162,10 @@ class TranscriptQueryAgent:
         
         # Clear Cache
         self.cached_context = None
+        self._context_hash = None
+        self._transcript_embeddings = None
+        self._prompt_template = None
+        self._prompt_prefix = None
         print("✅ Agent reloaded successfully.")
     
     def _load_transcripts(self) -> List[Dict]:
@@ -129,24 +175,46 @@ class TranscriptQueryAgent:
         if not self.transcripts_dir.exists():
             return transcripts
         
-        # Find all JSON transcript files
-        json_files = list(self.transcripts_dir.glob("*_gemini_*.json"))
-        
-        if not json_files:
-            return transcripts
+        # Find all JSON transcript files (sorted straight from the glob iterator)
+        json_files = sorted(self.transcripts_dir.glob("*_gemini_*.json"))
         
-        for json_file in sorted(json_files):
+        for json_file in json_files:
             try:
                 with open(json_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     # Add filename for reference
                     data['_filename'] = json_file.name
+                    # Pre-format the context block once instead of on every query
+                    data['_formatted_block'] = self._format_transcript_block(data, len(transcripts) + 1)
                     transcripts.append(data)
             except Exception as e:
                 print(f"⚠️  Error loading {json_file}: {e}")
         
         return transcripts
     
+    @staticmethod
+    def _format_transcript_block(transcript: Dict, index: int) -> str:
+        """Format a single transcript as a context block"""
+        filename = transcript.get('_filename', f'transcript_{index}')
+        service = transcript.get('service', 'unknown')
+        detected_lang = transcript.get('detected_language', 'unknown')
+        
+        block_parts = [
+            f"\n--- Recording {index} ({filename}) ---",
+            f"Service: {service}, Language: {detected_lang}\n",
+        ]
+        
+        # Use English transcript if available, otherwise original
+        transcript_text = transcript.get('transcript', '')
+        if not transcript_text:
+            transcript_text = transcript.get('transcript_original', '')
+        
+        if transcript_text:
+            block_parts.append(transcript_text)
+            block_parts.append("")  # Empty line between transcripts
+        
+        return "\n".join(block_parts)
+    
     def _get_transcript_context(self) -> str:
         """Format context for Gemini from Knowledge Base or Transcripts"""
         # Return cached context if available
@@ -179,47 +247,135 @@ class TranscriptQueryAgent:
         if not self.transcripts:
             return "No transcripts available."
         
-        context_parts = []
-        context_parts.append("=== TRANSCRIBED CALL RECORDINGS ===\n")
-        context_parts.append("The following are transcriptions of business call recordings.\n")
-        context_parts.append("Use this information to answer user queries.\n\n")
+        self.cached_context = self._TRANSCRIPT_HEADER + "\n".join(
+            t['_formatted_block'] for t in self.transcripts
+        )
+        return self.cached_context
+    
+    def _get_query_context(self, query: str) -> str:
+        """Get the context for a query, trimmed to the most relevant transcripts if over budget"""
+        context = self._get_transcript_context()
         
-        for i, transcript in enumerate(self.transcripts, 1):
-            filename = transcript.get('_filename', f'transcript_{i}')
-            service = transcript.get('service', 'unknown')
-            detected_lang = transcript.get('detected_language', 'unknown')
-            
-            context_parts.append(f"\n--- Recording {i} ({filename}) ---")
-            context_parts.append(f"Service: {service}, Language: {detected_lang}\n")
-            
-            # Use English transcript if available, otherwise original
-            transcript_text = transcript.get('transcript', '')
-            if not transcript_text:
-                transcript_text = transcript.get('transcript_original', '')
-            
-            if transcript_text:
-                context_parts.append(transcript_text)
-                context_parts.append("")  # Empty line between transcripts
+        # Knowledge base and small transcript sets are sent in full
+        if self.knowledge_base or not self.transcripts or len(context) <= self.CONTEXT_CHAR_BUDGET:
+            return context
         
-        self.cached_context = "\n".join(context_parts)
-        return self.cached_context
+        selected = self._select_transcripts(query)
+        return self._TRANSCRIPT_HEADER + "\n".join(t['_formatted_block'] for t in selected)
+    
+    def _select_transcripts(self, query: str) -> List[Dict]:
+        """Pick the transcripts most similar to the query that fit within the context budget"""
+        try:
+            scores = self._get_transcript_embeddings() @ self._embed_texts([query])[0]
+            order = np.argsort(-scores)
+        except Exception as e:
+            logger.warning(f"Embedding ranking failed, falling back to load order: {e}")
+            order = range(len(self.transcripts))
+        
+        selected = []
+        used = len(self._TRANSCRIPT_HEADER)
+        for i in order:
+            block_len = len(self.transcripts[i]['_formatted_block']) + 1
+            if used + block_len > self.CONTEXT_CHAR_BUDGET:
+                continue
+            selected.append(i)
+            used += block_len
+        
+        # Always send at least the best match, even if it alone exceeds the budget
+        if not selected:
+            selected.append(next(iter(order)))
+        
+        # Keep recordings in their original order
+        return [self.transcripts[i] for i in sorted(selected)]
+    
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with Gemini and return L2-normalized row vectors"""
+        vectors = []
+        for start in range(0, len(texts), 100):
+            result = self.client.models.embed_content(
+                model=self.EMBEDDING_MODEL,
+                contents=texts[start:start + 100]
+            )
+            vectors.extend(e.values for e in result.embeddings)
+        
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+    
+    def _get_transcript_embeddings(self) -> np.ndarray:
+        """Get transcript embeddings, embedding only those missing from the on-disk cache"""
+        if self._transcript_embeddings is not None:
+            return self._transcript_embeddings
+        
+        cache_path = self.transcripts_dir / ".embeddings_cache.json"
+        disk_cache = {}
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'r') as f:
+                    disk_cache = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Failed to load embeddings cache: {e}")
+        
+        # Key on content so edited transcripts are re-embedded
+        keys = [
+            f"{self.EMBEDDING_MODEL}:" + hashlib.blake2b(t['_formatted_block'].encode('utf-8'), digest_size=16).hexdigest()
+            for t in self.transcripts
+        ]
+        missing = [i for i, key in enumerate(keys) if key not in disk_cache]
+        
+        if missing:
+            vectors = self._embed_texts([self.transcripts[i]['_formatted_block'] for i in missing])
+            for i, vector in zip(missing, vectors):
+                disk_cache[keys[i]] = vector.tolist()
+            try:
+                with open(cache_path, 'w') as f:
+                    json.dump({key: disk_cache[key] for key in keys}, f)
+            except Exception as e:
+                print(f"⚠️ Failed to save embeddings cache: {e}")
+        
+        self._transcript_embeddings = np.asarray([disk_cache[key] for key in keys], dtype=np.float32)
+        return self._transcript_embeddings
+    
+    def _get_cache_key(self, model_name: str, query: str) -> str:
+        """Build the answer cache key from the context hash and normalized query"""
+        if self._context_hash is None:
+            # Config feeds the prompt too, so it is part of the context identity
+            h = hashlib.blake2b(digest_size=16)
+            h.update(self._get_transcript_context().encode('utf-8'))
+            h.update(json.dumps(self.config, sort_keys=True).encode('utf-8'))
+            self._context_hash = h.hexdigest()
+        
+        query_hash = hashlib.blake2b(query.strip().lower().encode('utf-8'), digest_size=16).hexdigest()
+        return f"{self.business_id}:{model_name}:{self._context_hash}:{query_hash}"
+    
+    @classmethod
+    def _has_devanagari(cls, text: str) -> bool:
+        """Check for Devanagari script with C-level substring searches on the UTF-8 bytes"""
+        if text.isascii():
+            return False
+        data = text.encode('utf-8')
+        return any(prefix in data for prefix in cls._DEVANAGARI_UTF8_PREFIXES)
     
     def _detect_query_language(self, query: str) -> str:
         """Detect the language of the query - only Hindi or English"""
-        # Check for Devanagari script (Hindi)
-        has_devanagari = any('\u0900' <= c <= '\u097F' for c in query)
-        
-        if has_devanagari:
+        # Check for Devanagari script (Hindi) in a bounded prefix
+        if self._has_devanagari(query[:self._LANG_SAMPLE_CHARS]):
             return "Hindi"
-        else:
-            # Default to English for everything else (including Kannada, Urdu, etc.)
-            return "English"
+        # Default to English for everything else (including Kannada, Urdu, etc.)
+        return "English"
     
     def _initialize_model(self):
         """Initialize and test which Gemini model works"""
         if self.model_name:
             return self.model_name
         
+        # Reuse the model found by a previous process (validated lazily in answer_query)
+        cached_model = self._load_cached_model()
+        if cached_model:
+            self.model_name = cached_model
+            print(f"✅ Using cached Gemini model: {cached_model}")
+            return cached_model
+        
         print("Model initialization: Testing available models...")
         for model_name in self.models_to_try:
             print(f"Testing model: {model_name}...")
@@ -230,6 +386,7 @@ class TranscriptQueryAgent:
                 )
                 self.model_name = model_name
                 print(f"✅ Using Gemini model: {model_name}")
+                self._save_cached_model(model_name)
                 return model_name
             except Exception as e:
                 print(f"❌ Model {model_name} failed: {e}")
@@ -240,87 +397,57 @@ class TranscriptQueryAgent:
         
         raise Exception("No working Gemini model found. Please check your API key and quota.")
     
-    def answer_query(self, query: str, language: Optional[str] = None, conversation_history: List[Dict] = None, caller_name: Optional[str] = None) -> Dict:
-        """Answer a query using the transcript knowledge base
+    def _load_cached_model(self) -> Optional[str]:
+        """Read the previously working model name from disk, if still a candidate"""
+        try:
+            with open(self.model_cache_path, 'r') as f:
+                model_name = json.load(f).get('model')
+        except (OSError, ValueError):
+            return None
+        return model_name if model_name in self.models_to_try else None
+    
+    def _save_cached_model(self, model_name: Optional[str]):
+        """Persist the working model name, or clear it when model_name is None"""
+        try:
+            if model_name is None:
+                self.model_cache_path.unlink(missing_ok=True)
+                return
+            self.model_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.model_cache_path, 'w') as f:
+                json.dump({"model": model_name}, f)
+        except OSError as e:
+            print(f"⚠️ Failed to update model cache: {e}")
+    
+    def _get_prompt_template(self) -> List[str]:
+        """Get the static pieces of the answer prompt, split around the per-query slots
         
-        Args:
-            query: The user's question
-            language: Optional language override (Hindi/English)
-            conversation_history: List of previous messages [{"role": "user/assistant", "text": "..."}]
-            caller_name: Optional name of the caller if known from DB
+        Returns [head, after_context, after_lead_capture, after_greeting, tail]; the
+        slots between them are context, lead capture instruction, greeting instruction
+        and query, in that order.
         """
-        if not self.transcripts and not self.knowledge_base:
-            return {
-                "query": query,
-                "answer": "No information available. Please upload recordings or documents to build the knowledge base.",
-                "error": "No transcripts or KB loaded"
-            }
+        if self._prompt_template is not None:
+            return self._prompt_template
         
-        # Move initialization inside try block to catch setup errors
-        try:
-            # Detect initial language (heuristic)
-            heuristic_lang = self._detect_query_language(query)
-            
-            # Initialize model (if not already cached)
-            model_name = self._initialize_model()
-            
-            # Get transcript context
-            context = self._get_transcript_context()
-            
-            # Analyze conversation history for lead capture logic
-            conversation_history = conversation_history or []
-            
-            # Count user turns (excluding current query which isn't in history yet)
-            user_turns = sum(1 for msg in conversation_history if msg.get('role') == 'user')
-            current_turn = user_turns + 1
-            
-            # Check if we already asked for NAME in previous turn (we don't ask for phone anymore)
-            asked_for_name = any(
-                ("name" in msg.get('text', '').lower() or "naam" in msg.get('text', '').lower())
-                for msg in conversation_history 
-                if msg.get('role') == 'assistant'
-            )
-            
-            # Determine lead capture instruction
-            lead_capture_instruction = ""
-            
-            # IF WE KNOW THE NAME (Persistent Recognition) -> Start of Call
-            if caller_name and current_turn <= 1:
-                lead_capture_instruction = f"IMPORTANT: The caller is known as '{caller_name}'. Welcome them back by name (e.g., 'Welcome back {caller_name}' or 'Hi {caller_name}'). **DO NOT** ask for their name again."
-            
-            # IF WE DON'T KNOW THE NAME -> Ask once
-            elif not caller_name and not asked_for_name and current_turn <= 1:
-                # Ask in the FIRST turn ONLY
-                # Ask in the FIRST turn ONLY
-                lead_capture_instruction = "IMPORTANT: First ANSWER the user's query efficiently. THEN, casually ask for their name (e.g., 'By the way, may I know your name?'). **DO NOT** ask for their phone number."
-            
-            else:
-                # Never ask again, and NEVER ask for phone number
-                lead_capture_instruction = "**DO NOT** ask for name or phone number. Focus on the query."
-
-            # Determine greeting instruction/ending
-            greeting_instruction = "Greet the customer in ENGLISH (e.g., 'Hello! Welcome to Rainbow Driving School.'). Only switch to Hindi if the user speaks Hindi first."
-            ending_instruction = "If the user says 'thank you', 'bye', or indicates they are done, politely say goodbye (e.g., 'Thank you for calling Rainbow Driving School. Have a safe day!')."
-            
-            if len(conversation_history) > 0:
-                greeting_instruction = "**DO NOT** greet the customer (no 'Hello', 'Hi', 'Namaste', etc.). Go straight to the answer."
-            
-            # Get business details for fallback
-            owner_name = self.config.get('owner_name', 'us')
-            owner_phone = self.config.get('phone', 'directly')
-            agent_name = self.config.get('agent_name', 'Virtual Assistant')
-            business_name = self.config.get('business_name', 'our business')
-            
-            # Get explicit agent behavior instructions
-            agent_behavior = self.config.get('agent_behavior', '')
-            behavior_instruction = ""
-            if agent_behavior:
-                behavior_instruction = f"8. **CUSTOM OWNER INSTRUCTIONS**: {agent_behavior}\n"
-            
-            prompt = f"""You are {agent_name}, the AI assistant for {business_name}, responding to customer inquiries. Answer naturally and conversationally.
+        ending_instruction = "If the user says 'thank you', 'bye', or indicates they are done, politely say goodbye (e.g., 'Thank you for calling Rainbow Driving School. Have a safe day!')."
+        
+        # Get business details for fallback
+        owner_name = self.config.get('owner_name', 'us')
+        owner_phone = self.config.get('phone', 'directly')
+        agent_name = self.config.get('agent_name', 'Virtual Assistant')
+        business_name = self.config.get('business_name', 'our business')
+        
+        # Get explicit agent behavior instructions
+        agent_behavior = self.config.get('agent_behavior', '')
+        behavior_instruction = ""
+        if agent_behavior:
+            behavior_instruction = f"8. **CUSTOM OWNER INSTRUCTIONS**: {agent_behavior}\n"
+        
+        # Render once with a marker in each per-query slot, then split on it
+        slot = "\x00"
+        template = f"""You are {agent_name}, the AI assistant for {business_name}, responding to customer inquiries. Answer naturally and conversationally.
 
 CONTEXT FROM PREVIOUS CALL RECORDINGS:
-{context}
+{slot}
 
 CRITICAL INSTRUCTIONS:
 1. **LANGUAGE MATCHING (HIGHEST PRIORITY)**: 
@@ -362,7 +489,7 @@ CRITICAL INSTRUCTIONS:
 5. If the information is not available, suggest they call **{owner_name} at {owner_phone}**.
 6. **LEAD CAPTURE STRATEGY**: 
    - We must capture name and phone number early (First 2 turns).
-   - {lead_capture_instruction}
+   - {slot}
    - If asking, request BOTH together.
     - If asking, request BOTH together.
 7. **NUMBER FORMATTING (CRITICAL FOR TTS)**:
@@ -371,11 +498,11 @@ CRITICAL INSTRUCTIONS:
      - ✅ "FEES: दो हज़ार छह सौ रुपये" -> TTS reads "Do Hazaar Chhe Sau Rupye" (Good)
      - ✅ "Date: 15 taareekh" -> "पंद्रह तारीख"
    - **English**: Digits are okay, but words are safer for prices (e.g., "2600 rupees" or "twenty-six hundred rupees").
-6. **GREETING**: {greeting_instruction}
+6. **GREETING**: {slot}
 7. **ENDING**: {ending_instruction}
 {behavior_instruction}
 
-CUSTOMER QUERY: {query}
+CUSTOMER QUERY: {slot}
 
 ---
 🛑 **FINAL EXECUTION PROTOCOL (MUST FOLLOW STEP-BY-STEP)** 🛑
@@ -403,36 +530,155 @@ CUSTOMER QUERY: {query}
 
 Respond as {agent_name} (in the detected Target Language only):"""
         
+        self._prompt_template = template.split(slot)
+        return self._prompt_template
+    
+    def _build_prompt(self, context: str, lead_capture_instruction: str, greeting_instruction: str, query: str) -> str:
+        """Assemble the answer prompt from the cached template pieces"""
+        head, after_context, after_lead, after_greeting, tail = self._get_prompt_template()
+        
+        # The prefix up to the lead capture slot only changes when the context does.
+        # Read the cached pair once; another request thread may replace it meanwhile.
+        cached = self._prompt_prefix
+        if cached is None or cached[0] is not context:
+            cached = (context, head + context + after_context)
+            self._prompt_prefix = cached
+        
+        return "".join([
+            cached[1], lead_capture_instruction, after_lead,
+            greeting_instruction, after_greeting, query, tail
+        ])
+    
+    def answer_query(self, query: str, language: Optional[str] = None, conversation_history: List[Dict] = None, caller_name: Optional[str] = None, on_chunk: Optional[Callable[[str], None]] = None) -> Dict:
+        """Answer a query using the transcript knowledge base
+        
+        Args:
+            query: The user's question
+            language: Optional language override (Hindi/English)
+            conversation_history: List of previous messages [{"role": "user/assistant", "text": "..."}]
+            caller_name: Optional name of the caller if known from DB
+            on_chunk: Optional callback; if given, the response is streamed and each text chunk is passed to it as it arrives
+        """
+        if not self.transcripts and not self.knowledge_base:
+            return {
+                "query": query,
+                "answer": "No information available. Please upload recordings or documents to build the knowledge base.",
+                "error": "No transcripts or KB loaded"
+            }
+        
+        # Move initialization inside try block to catch setup errors
+        try:
+            # Detect initial language (heuristic)
+            heuristic_lang = self._detect_query_language(query)
+            
+            # Initialize model (if not already cached)
+            model_name = self._initialize_model()
+            
+            # Analyze conversation history for lead capture logic
+            conversation_history = conversation_history or []
+            
+            # Only stateless queries (no history, unknown caller) are safe to answer from cache.
+            # Check before building the query context so hits skip the query embedding call.
+            cache_key = None
+            if self.query_cache and not conversation_history and not caller_name:
+                cache_key = self._get_cache_key(model_name, query)
+                cached = self.query_cache.get(cache_key)
+                if cached:
+                    if on_chunk:
+                        on_chunk(cached['answer'])
+                    return cached
+            
+            # Get transcript context (trimmed to the relevant transcripts if too large)
+            context = self._get_query_context(query)
+            
+            # Count user turns (excluding current query which isn't in history yet)
+            user_turns = sum(1 for msg in conversation_history if msg.get('role') == 'user')
+            current_turn = user_turns + 1
+            
+            # Check if we already asked for NAME in previous turn (we don't ask for phone anymore)
+            asked_for_name = any(
+                ("name" in msg.get('text', '').lower() or "naam" in msg.get('text', '').lower())
+                for msg in conversation_history 
+                if msg.get('role') == 'assistant'
+            )
+            
+            # Determine lead capture instruction
+            lead_capture_instruction = ""
+            
+            # IF WE KNOW THE NAME (Persistent Recognition) -> Start of Call
+            if caller_name and current_turn <= 1:
+                lead_capture_instruction = f"IMPORTANT: The caller is known as '{caller_name}'. Welcome them back by name (e.g., 'Welcome back {caller_name}' or 'Hi {caller_name}'). **DO NOT** ask for their name again."
+            
+            # IF WE DON'T KNOW THE NAME -> Ask once
+            elif not caller_name and not asked_for_name and current_turn <= 1:
+                # Ask in the FIRST turn ONLY
+                # Ask in the FIRST turn ONLY
+                lead_capture_instruction = "IMPORTANT: First ANSWER the user's query efficiently. THEN, casually ask for their name (e.g., 'By the way, may I know your name?'). **DO NOT** ask for their phone number."
+            
+            else:
+                # Never ask again, and NEVER ask for phone number
+                lead_capture_instruction = "**DO NOT** ask for name or phone number. Focus on the query."
+
+            # Determine greeting instruction
+            greeting_instruction = "Greet the customer in ENGLISH (e.g., 'Hello! Welcome to Rainbow Driving School.'). Only switch to Hindi if the user speaks Hindi first."
+            
+            if len(conversation_history) > 0:
+                greeting_instruction = "**DO NOT** greet the customer (no 'Hello', 'Hi', 'Namaste', etc.). Go straight to the answer."
+            
+            prompt = self._build_prompt(context, lead_capture_instruction, greeting_instruction, query)
+            
             # Generate response with retries
             max_retries = 3
             import time
             import random
             
             last_error = None
+            streamed = False
+            reprobed = False
             
             for attempt in range(max_retries):
                 try:
-                    response = self.client.models.generate_content(
-                        model=model_name,
-                        config=types.GenerateContentConfig(temperature=0.1),
-                        contents=[
-                            types.Content(
-                                parts=[
-                                    types.Part(text=prompt)
-                                ]
-                            )
-                        ]
-                    )
+                    contents = [
+                        types.Content(
+                            parts=[
+                                types.Part(text=prompt)
+                            ]
+                        )
+                    ]
+                    generation_config = types.GenerateContentConfig(temperature=0.1)
+                    
+                    if on_chunk:
+                        # Stream tokens to the caller as they are decoded
+                        answer_parts = []
+                        for chunk in self.client.models.generate_content_stream(
+                            model=model_name,
+                            config=generation_config,
+                            contents=contents
+                        ):
+                            if chunk.text:
+                                answer_parts.append(chunk.text)
+                                on_chunk(chunk.text)
+                                streamed = True
+                        answer = "".join(answer_parts).strip()
+                    else:
+                        response = self.client.models.generate_content(
+                            model=model_name,
+                            config=generation_config,
+                            contents=contents
+                        )
+                        answer = response.text.strip()
                     
-                    answer = response.text.strip()
+                    # A blocked or empty response is an error, never an answer to cache
+                    if not answer:
+                        raise Exception("Model returned an empty answer")
                     
                     # Detect language from ANSWER (to guide TTS)
                     # If answer contains Devanagari, it is Hindi
                     final_language = "English"
-                    if any('\u0900' <= c <= '\u097F' for c in answer):
+                    if self._has_devanagari(answer):
                         final_language = "Hindi"
                     
-                    return {
+                    result = {
                         "query": query,
                         "query_language": final_language,
                         "answer": answer,
@@ -441,14 +687,32 @@ Respond as {agent_name} (in the detected Target Language only):"""
                         "transcripts_used": len(self.transcripts)
                     }
                     
+                    if cache_key:
+                        self.query_cache.set(cache_key, result)
+                    
+                    return result
+                    
                 except Exception as loop_e:
                     last_error = loop_e
                     error_str = str(loop_e)
+                    # The caller already has part of the answer; retrying would stream it again
+                    if streamed:
+                        raise loop_e
                     # Only retry on transient errors or rate limits
                     if "429" in error_str or "503" in error_str or "500" in error_str or "quota" in error_str.lower():
                         sleep_time = (attempt + 1) * 2 + random.uniform(0, 1)
                         print(f"⚠️  Attempt {attempt+1} failed ({error_str}), retrying in {sleep_time:.1f}s...")
                         time.sleep(sleep_time)
+                    elif not reprobed and any(marker in error_str for marker in MODEL_ERROR_MARKERS):
+                        # Cached model may be retired or unusable with this key - forget it and probe
+                        # again (once per query, so a request-level 400 doesn't loop through probes)
+                        print(f"⚠️  Model {model_name} unavailable, re-probing models...")
+                        reprobed = True
+                        self.model_name = None
+                        self._save_cached_model(None)
+                        model_name = self._initialize_model()
+                        if cache_key:
+                            cache_key = self._get_cache_key(model_name, query)
                     else:
                         raise loop_e
             
@@ -619,17 +883,25 @@ CLASSIFICATION: [HOT_LEAD or GENERAL_INQUIRY or SPAM or UNRELATED]"""
                     print(f"  Total transcript length: {total_chars:,} characters")
                     continue
                 
-                # Process query
+                # Process query, streaming the answer as it is generated
                 print("\n🤔 Processing your question...")
-                result = self.answer_query(query)
+                streamed = []
+                
+                def print_chunk(text):
+                    if not streamed:
+                        print("\n💡 Answer:")
+                        print("-" * 70)
+                    streamed.append(text)
+                    print(text, end='', flush=True)
+                
+                result = self.answer_query(query, on_chunk=print_chunk)
+                
+                if streamed:
+                    print()
+                    print("-" * 70)
                 
                 if "error" in result:
                     print(f"❌ Error: {result['answer']}")
-                else:
-                    print(f"\n💡 Answer ({result.get('query_language', 'unknown')}):")
-                    print("-" * 70)
-                    print(result['answer'])
-                    print("-" * 70)
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
@@ -638,12 +910,69 @@ CLASSIFICATION: [HOT_LEAD or GENERAL_INQUIRY or SPAM or UNRELATED]"""
                 print(f"\n❌ Error: {str(e)}")
 
 
+def run_daemon(agent: TranscriptQueryAgent):
+    """Serve queries from an already-loaded agent over a unix socket (one JSON object per line)"""
+    import socketserver
+    
+    class QueryHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    result = agent.answer_query(request['query'])
+                except Exception as e:
+                    result = {"query": None, "answer": str(e), "error": "bad_request"}
+                self.wfile.write((json.dumps(result, ensure_ascii=False) + "\n").encode('utf-8'))
+    
+    AGENT_SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # Remove a stale socket left by a previous daemon
+    AGENT_SOCKET_PATH.unlink(missing_ok=True)
+    
+    with socketserver.UnixStreamServer(str(AGENT_SOCKET_PATH), QueryHandler) as server:
+        print(f"🛰️  Agent daemon listening on {AGENT_SOCKET_PATH}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Daemon stopped.")
+        finally:
+            AGENT_SOCKET_PATH.unlink(missing_ok=True)
+
+
+def query_daemon(query: str) -> Optional[Dict]:
+    """Send a query to a running daemon; returns None if no daemon is reachable"""
+    if not hasattr(socket, 'AF_UNIX') or not AGENT_SOCKET_PATH.exists():
+        return None
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(AGENT_SOCKET_PATH))
+            sock.sendall((json.dumps({"query": query}) + "\n").encode('utf-8'))
+            with sock.makefile('rb') as f:
+                line = f.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
 def main():
     """Main function"""
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    use_cache = "--no-cache" not in args
+    daemon = "--daemon" in args
+    args = [a for a in args if a not in ("--no-cache", "--daemon")]
+    
+    if daemon:
+        # Long-lived agent that keeps transcripts and the model warm
+        try:
+            agent = TranscriptQueryAgent(use_cache=use_cache)
+            run_daemon(agent)
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            sys.exit(1)
+    elif not args:
         # Interactive mode
         try:
-            agent = TranscriptQueryAgent()
+            agent = TranscriptQueryAgent(use_cache=use_cache)
             agent.interactive_mode()
         except Exception as e:
             print(f"❌ Error: {str(e)}")
@@ -652,10 +981,13 @@ def main():
             sys.exit(1)
     else:
         # Single query mode
-        query = " ".join(sys.argv[1:])
+        query = " ".join(args)
         try:
-            agent = TranscriptQueryAgent()
-            result = agent.answer_query(query)
+            # Prefer a warm daemon; fall back to loading the agent in-process
+            result = query_daemon(query) if use_cache else None
+            if result is None:
+                agent = TranscriptQueryAgent(use_cache=use_cache)
+                result = agent.answer_query(query)
             
             if "error" in result:
                 print(f"❌ Error: {result['answer']}")
@@ -2,6 +2,7 @@
 import os
 import json
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load env vars first
@@ -18,7 +19,8 @@ def sync_assistants():
         print("No businesses directory found.")
         return
 
-    count = 0
+    # Collect assistants to update
+    jobs = []
     for item in businesses_dir.iterdir():
         if item.is_dir():
             business_id = item.name
@@ -28,16 +30,27 @@ def sync_assistants():
             assistant_id = config.get('vapi_assistant_id')
             
             if assistant_id:
-                print(f"  Found Assistant ID: {assistant_id}. Updating...")
-                result = update_vapi_assistant(assistant_id, business_id, config)
-                if result:
-                    print(f"  ✅ Successfully updated {assistant_id}")
-                    count += 1
-                else:
-                    print(f"  ❌ Failed to update {assistant_id}")
+                print(f"  Found Assistant ID: {assistant_id}. Queued for update.")
+                jobs.append((business_id, assistant_id, config))
             else:
                 print(f"  ⚠️ No Vapi Assistant ID in config for {business_id}")
 
+    # Updates are independent network calls, so run them concurrently
+    count = 0
+    if jobs:
+        print(f"\nUpdating {len(jobs)} assistants...")
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+            results = list(executor.map(
+                lambda job: update_vapi_assistant(job[1], job[0], job[2]), jobs
+            ))
+        
+        for (business_id, assistant_id, _), result in zip(jobs, results):
+            if result:
+                print(f"  ✅ Successfully updated {assistant_id} ({business_id})")
+                count += 1
+            else:
+                print(f"  ❌ Failed to update {assistant_id} ({business_id})")
+
     print(f"\nSync Complete. Updated {count} assistants.")
 
 if __name__ == "__main__":
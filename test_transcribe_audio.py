@@ -0,0 +1,22 @@
+from transcribe_audio import _stitch_transcripts
+
+
+def test_stitch_drops_overlap_after_speaker_label():
+    parts = [
+        "Speaker 1: Hello there\nSpeaker 2: how are you doing",
+        "Speaker 1: how are you doing today",
+    ]
+    assert _stitch_transcripts(parts) == "Speaker 1: Hello there\nSpeaker 2: how are you doing today"
+
+
+def test_stitch_keeps_new_lines_after_overlap():
+    parts = [
+        "Speaker 1: so how are you doing.",
+        "Speaker 1: How are you doing?\nSpeaker 2: Fine, thanks",
+    ]
+    assert _stitch_transcripts(parts) == "Speaker 1: so how are you doing.\nSpeaker 2: Fine, thanks"
+
+
+def test_stitch_without_overlap_joins_lines():
+    parts = ["Speaker 1: first chunk", "Speaker 2: second chunk"]
+    assert _stitch_transcripts(parts) == "Speaker 1: first chunk\nSpeaker 2: second chunk"
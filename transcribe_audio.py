@@ -5,10 +5,17 @@ Supports multiple transcription services optimized for Indian languages.
 """
 
 import os
+import re
 import sys
 import json
+import mimetypes
+import shutil
+import tempfile
+import threading
+import subprocess
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Translation support
 try:
@@ -18,11 +25,82 @@ except ImportError:
     TRANSLATION_AVAILABLE = False
     print("⚠️  deep-translator not installed. Install with: pip install deep-translator")
 
+# One GoogleTranslator per thread, reused for the whole run. Instances keep per-request
+# state (the query params), so a single instance must not be shared across threads.
+_translator_local = threading.local()
+
+def _get_translator():
+    """Get this thread's shared English translator"""
+    translator = getattr(_translator_local, "translator", None)
+    if translator is None:
+        translator = GoogleTranslator(source='auto', target='en')
+        _translator_local.translator = translator
+    return translator
+
+# Faster JSON serialization for Unicode-heavy transcripts (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Whitespace-delimited words, compiled once for the translation fallback
+_WORD_RE = re.compile(r'\S+')
+
+# Speaker labels Gemini puts at the start of each line ("Speaker 1:", "Customer:", "Business Owner:")
+_SPEAKER_LABEL_RE = re.compile(r'^[ \t]*(?:Speaker[ \t]*\d+|[A-Z][A-Za-z]*(?:[ \t][A-Z][A-Za-z]*)?)[ \t]*:', re.MULTILINE)
+
+# Punctuation at either end of a word, ignored when matching chunk overlaps
+_EDGE_PUNCT_RE = re.compile(r'^[\W_]+|[\W_]+$')
+
+# Audio types the stdlib table may lack or map differently across platforms
+mimetypes.add_type("audio/wav", ".wav")
+mimetypes.add_type("audio/mp4", ".m4a")
+mimetypes.add_type("audio/flac", ".flac")
+mimetypes.add_type("audio/ogg", ".ogg")
+mimetypes.add_type("audio/webm", ".webm")
+
+# Transcription models in order of preference; the first available one is used for the whole run
+GEMINI_TRANSCRIBE_MODELS = ["gemini-1.5-pro", "gemini-1.5-flash", "gemini-2.0-flash-exp"]
+_gemini_model = None
+_gemini_model_lock = threading.Lock()
+
+# Transcription instructions sent with every Gemini request
+GEMINI_TRANSCRIBE_PROMPT = """
+Listen to this audio carefully. It is a business call recording.
+
+Please transcribe the dialogue with the following requirements:
+1. ALWAYS identify and label each speaker for EVERY line of dialogue.
+2. Use the format "Speaker 1:", "Speaker 2:", etc. before each speaker's dialogue.
+3. Transcribe the dialogue exactly as spoken, preserving the original language(s).
+4. If the conversation is in multiple languages (Kannada, Hindi, English, or a mix), transcribe each part accurately in its original language.
+5. Maintain proper punctuation and sentence structure.
+6. Do not translate - provide the exact transcription in the original language(s).
+7. Include all business terms, names, and important details exactly as spoken.
+
+IMPORTANT: Every line of dialogue must be prefixed with a speaker label (Speaker 1:, Speaker 2:, etc.). 
+If you can identify the role (Customer, Business Owner, etc.), you may use descriptive labels, but always use consistent labels throughout.
+
+Provide only the transcription, no additional commentary.
+"""
+
+# Recordings longer than this are transcribed as overlapping chunks
+GEMINI_CHUNK_SECONDS = 600
+GEMINI_CHUNK_OVERLAP_SECONDS = 5
+
+# Max size of audio sent inline to Google Cloud Speech-to-Text
+GOOGLE_INLINE_AUDIO_LIMIT = 10 * 1024 * 1024
+
 
 
 
-def transcribe_with_google(audio_path, api_key=None):
-    """Transcribe using Google Cloud Speech-to-Text (excellent for Kannada and Hindi)"""
+def transcribe_with_google(audio_path, api_key=None, gcs_uri=None, diarize=False):
+    """Transcribe using Google Cloud Speech-to-Text (excellent for Kannada and Hindi)
+    
+    Pass gcs_uri (gs://bucket/object) for recordings already in Cloud Storage; the
+    local file is then never read into memory. Speaker diarization (and the word
+    timings it needs) is slow server-side, so it only runs when diarize=True.
+    """
     try:
         from google.cloud import speech
         import io
@@ -38,9 +116,16 @@ def transcribe_with_google(audio_path, api_key=None):
         # Initialize client
         client = speech.SpeechClient()
         
-        # Read audio file
-        with io.open(audio_path, "rb") as audio_file:
-            content = audio_file.read()
+        if gcs_uri:
+            audio = speech.RecognitionAudio(uri=gcs_uri)
+        else:
+            # Inline audio is capped at 10 MB by the API, so larger files must come from GCS
+            if os.path.getsize(audio_path) > GOOGLE_INLINE_AUDIO_LIMIT:
+                print("⚠️  Audio is larger than 10 MB. Upload it to Cloud Storage and pass gcs_uri.")
+                return None
+            
+            with io.open(audio_path, "rb") as audio_file:
+                audio = speech.RecognitionAudio(content=audio_file.read())
         
         # Configure for Indian languages - try Kannada first, then Hindi, then auto-detect
         # Google supports both kn-IN (Kannada) and hi-IN (Hindi) explicitly
@@ -50,19 +135,14 @@ def transcribe_with_google(audio_path, api_key=None):
             language_code="kn-IN",  # Kannada (India)
             alternative_language_codes=["hi-IN", "en-IN"],  # Hindi and English as alternatives
             enable_automatic_punctuation=True,
-            enable_word_time_offsets=True,
-            enable_speaker_diarization=True,
+            enable_word_time_offsets=diarize,
+            enable_speaker_diarization=diarize,
             model="latest_long",  # Best for long-form audio
         )
         
-        audio = speech.RecognitionAudio(content=content)
-        
         print("🎤 Transcribing with Google Cloud Speech-to-Text (optimized for Kannada/Hindi)...")
         
-        # Perform transcription
-        response = client.recognize(config=config, audio=audio)
-        
-        # Also try long-running operation for better results
+        # Perform transcription (long-running operation handles full-length calls)
         operation = client.long_running_recognize(config=config, audio=audio)
         response = operation.result(timeout=300)  # 5 minute timeout
         
@@ -139,6 +219,158 @@ def transcribe_with_assemblyai(audio_path, api_key=None):
         return None
 
 
+def _get_gemini_model(client):
+    """Get the first available transcription model, probing only on the first call of a run"""
+    global _gemini_model
+    with _gemini_model_lock:
+        if _gemini_model is not None:
+            return _gemini_model
+        
+        last_error = None
+        for model_name in GEMINI_TRANSCRIBE_MODELS:
+            try:
+                # Metadata lookup only, so probing doesn't bill a transcription
+                client.models.get(model=model_name)
+            except Exception as e:
+                last_error = e
+                if "404" in str(e) or "NOT_FOUND" in str(e):
+                    print(f"⚠️  Model {model_name} not found, trying next...")
+                    continue
+                else:
+                    # For quota errors or other issues, raise immediately
+                    raise
+            print(f"✅ Using model: {model_name}")
+            _gemini_model = model_name
+            return model_name
+        
+        raise Exception(f"All models failed. Last error: {last_error}")
+
+
+def _transcribe_file_with_gemini(client, audio_path):
+    """Upload one audio file and transcribe it with the run's Gemini model"""
+    model_name = _get_gemini_model(client)
+    
+    # Determine MIME type
+    mimetype, _ = mimetypes.guess_type(audio_path)
+    if not mimetype or not mimetype.startswith("audio/"):
+        mimetype = "audio/mpeg"
+    
+    # Upload audio once via the File API
+    print("⏳ Uploading audio file...")
+    uploaded_file = client.files.upload(file=audio_path, config={"mime_type": mimetype})
+    
+    # Generate transcription referencing the uploaded file
+    print("⏳ Transcribing with Gemini...")
+    try:
+        response = client.models.generate_content(
+            model=model_name,
+            contents=[GEMINI_TRANSCRIBE_PROMPT, uploaded_file]
+        )
+    finally:
+        # Uploaded files expire anyway, but don't leave them around
+        try:
+            client.files.delete(name=uploaded_file.name)
+        except Exception as e:
+            print(f"⚠️  Could not delete uploaded file: {str(e)[:100]}")
+    
+    return response.text.strip()
+
+
+def _get_audio_duration(audio_path):
+    """Return audio duration in seconds using ffprobe, or None if unavailable"""
+    try:
+        output = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", audio_path],
+            capture_output=True, text=True, check=True
+        ).stdout
+        return float(output.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+def _split_audio(audio_path, chunk_s=GEMINI_CHUNK_SECONDS, overlap_s=GEMINI_CHUNK_OVERLAP_SECONDS):
+    """Split long audio into overlapping chunks with ffmpeg stream copy (no re-encode)
+    
+    Returns (chunk_paths, temp_dir). Short audio, or a missing ffmpeg, gives
+    ([audio_path], None) so the caller transcribes the file as-is.
+    """
+    duration = _get_audio_duration(audio_path)
+    if not duration or duration <= chunk_s + overlap_s:
+        return [audio_path], None
+    
+    temp_dir = tempfile.mkdtemp(prefix="vani_chunks_")
+    extension = Path(audio_path).suffix
+    chunk_paths = []
+    start = 0.0
+    try:
+        # The previous chunk already runs overlap_s past this start, so a shorter tail is covered
+        while start + overlap_s < duration:
+            chunk_path = os.path.join(temp_dir, f"chunk_{len(chunk_paths):03d}{extension}")
+            subprocess.run(
+                ["ffmpeg", "-v", "error", "-y", "-ss", str(start), "-t", str(chunk_s + overlap_s),
+                 "-i", audio_path, "-c", "copy", chunk_path],
+                capture_output=True, check=True
+            )
+            chunk_paths.append(chunk_path)
+            start += chunk_s
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️  Could not split audio ({e}), transcribing as a single file...")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return [audio_path], None
+    
+    return chunk_paths, temp_dir
+
+
+def _overlap_words(text):
+    """Word matches in text with speaker labels left out, plus their normalized forms"""
+    label_spans = [m.span() for m in _SPEAKER_LABEL_RE.finditer(text)]
+    matches, words = [], []
+    for m in _WORD_RE.finditer(text):
+        if any(start <= m.start() < end for start, end in label_spans):
+            continue
+        # Chunk edges often differ only in punctuation or case ("doing." vs "doing")
+        word = _EDGE_PUNCT_RE.sub('', m.group()).lower()
+        if word:
+            matches.append(m)
+            words.append(word)
+    return matches, words
+
+
+def _stitch_transcripts(parts, max_overlap_words=40):
+    """Join chunk transcripts, dropping the words repeated in each chunk overlap
+    
+    Every chunk starts with a speaker label, so labels are ignored when matching the
+    end of one chunk against the start of the next.
+    """
+    stitched = parts[0].strip()
+    for part in parts[1:]:
+        part = part.strip()
+        prev_words = _overlap_words(stitched)[1][-max_overlap_words:]
+        next_matches, next_words = _overlap_words(part)
+        next_matches, next_words = next_matches[:max_overlap_words], next_words[:max_overlap_words]
+        
+        # Longest run of words ending the previous chunk that also starts this one
+        # (at least two words, so a lone repeated word isn't mistaken for overlap)
+        overlap = 0
+        for k in range(min(len(prev_words), len(next_words)), 1, -1):
+            if prev_words[-k:] == next_words[:k]:
+                overlap = k
+                break
+        
+        separator = "\n"
+        if overlap:
+            rest = part[next_matches[overlap - 1].end():]
+            part = rest.lstrip()
+            # A cut mid-line continues the previous chunk's last speaker turn
+            if "\n" not in rest[:len(rest) - len(part)]:
+                separator = " "
+        
+        if part:
+            stitched = f"{stitched}{separator}{part}"
+    return stitched
+
+
 def transcribe_with_gemini(audio_path, api_key=None):
     """Transcribe using Google Gemini API (excellent for multilingual content)"""
     try:
@@ -156,87 +388,21 @@ def transcribe_with_gemini(audio_path, api_key=None):
         # Initialize Gemini client
         client = genai.Client(api_key=api_key)
         
-        # Read audio file
-        print("⏳ Reading audio file...")
-        with open(audio_path, "rb") as audio_file:
-            audio_data = audio_file.read()
-        
-        # Determine MIME type
-        mimetype = "audio/mpeg"
-        if audio_path.endswith('.wav'):
-            mimetype = "audio/wav"
-        elif audio_path.endswith('.m4a'):
-            mimetype = "audio/mp4"
-        
-        # Create prompt for transcription
-        prompt = """
-Listen to this audio carefully. It is a business call recording.
-
-Please transcribe the dialogue with the following requirements:
-1. ALWAYS identify and label each speaker for EVERY line of dialogue.
-2. Use the format "Speaker 1:", "Speaker 2:", etc. before each speaker's dialogue.
-3. Transcribe the dialogue exactly as spoken, preserving the original language(s).
-4. If the conversation is in multiple languages (Kannada, Hindi, English, or a mix), transcribe each part accurately in its original language.
-5. Maintain proper punctuation and sentence structure.
-6. Do not translate - provide the exact transcription in the original language(s).
-7. Include all business terms, names, and important details exactly as spoken.
-
-IMPORTANT: Every line of dialogue must be prefixed with a speaker label (Speaker 1:, Speaker 2:, etc.). 
-If you can identify the role (Customer, Business Owner, etc.), you may use descriptive labels, but always use consistent labels throughout.
-
-Provide only the transcription, no additional commentary.
-"""
-        
-        # Generate transcription using direct content method
-        print("⏳ Transcribing with Gemini...")
-        from google.genai import types
-        
-        # Try different models in order
-        models_to_try = ["gemini-1.5-pro", "gemini-1.5-flash", "gemini-2.0-flash-exp"]
-        response = None
-        last_error = None
-        
-        for model_name in models_to_try:
-            try:
-                # Use Content with Parts structure
-                response = client.models.generate_content(
-                    model=model_name,
-                    contents=[
-                        types.Content(
-                            parts=[
-                                types.Part(text=prompt),
-                                types.Part(
-                                    inline_data=types.Blob(
-                                        mime_type=mimetype,
-                                        data=audio_data
-                                    )
-                                )
-                            ]
-                        )
-                    ]
-                )
-                print(f"✅ Using model: {model_name}")
-                break
-            except Exception as e:
-                last_error = e
-                if "404" in str(e) or "NOT_FOUND" in str(e):
-                    print(f"⚠️  Model {model_name} not found, trying next...")
-                    continue
-                else:
-                    # For quota errors or other issues, raise immediately
-                    raise
-        
-        if response is None:
-            raise Exception(f"All models failed. Last error: {last_error}")
-        
-        # Extract transcript
-        transcript = response.text.strip()
+        # Long recordings are split into overlapping chunks and transcribed concurrently
+        chunk_paths, chunk_dir = _split_audio(audio_path)
+        try:
+            if len(chunk_paths) == 1:
+                transcript = _transcribe_file_with_gemini(client, chunk_paths[0])
+            else:
+                print(f"✂️  Split audio into {len(chunk_paths)} chunks, transcribing concurrently...")
+                with ThreadPoolExecutor(max_workers=min(4, len(chunk_paths))) as executor:
+                    parts = list(executor.map(lambda path: _transcribe_file_with_gemini(client, path), chunk_paths))
+                transcript = _stitch_transcripts(parts)
+        finally:
+            if chunk_dir:
+                shutil.rmtree(chunk_dir, ignore_errors=True)
         
-        # Try to get more structured response if available
         detected_language = "unknown"
-        if hasattr(response, 'candidates') and response.candidates:
-            # Try to detect language from response metadata if available
-            pass
         
         result = {
             "transcript": transcript,
@@ -300,25 +466,68 @@ def transcribe_with_whisper_local(audio_path, model_size="large-v3"):
         return None
 
 
+def _translate_non_ascii_words(text, translator):
+    """Translate only the non-ASCII words in text, keeping ASCII words and spacing as is"""
+    # Only the spans of foreign words are kept; everything else is sliced from text on rebuild
+    foreign_spans = [m.span() for m in _WORD_RE.finditer(text) if not m.group().isascii()]
+    if not foreign_spans:
+        return text
+    foreign_words = [text[start:end] for start, end in foreign_spans]
+    
+    # Send all foreign words in a single request, one per line; words contain no
+    # whitespace, so the translated lines map back 1:1 unless the service merges them
+    translated_words = None
+    try:
+        translated_block = translator.translate("\n".join(foreign_words))
+        if translated_block:
+            lines = translated_block.split("\n")
+            if len(lines) == len(foreign_words):
+                translated_words = lines
+    except Exception:
+        pass
+    
+    if translated_words is None:
+        # Fall back to one request per word with the same translator
+        translated_words = []
+        for word in foreign_words:
+            try:
+                translated_words.append(translator.translate(word))
+            except Exception:
+                translated_words.append(word)
+    
+    parts = []
+    last_end = 0
+    for (start, end), word, translated_word in zip(foreign_spans, foreign_words, translated_words):
+        parts.append(text[last_end:start])
+        parts.append(translated_word or word)
+        last_end = end
+    parts.append(text[last_end:])
+    
+    return ''.join(parts)
+
+
 def translate_to_english(text, translator=None):
     """Translate text to English, handling mixed languages"""
     if not TRANSLATION_AVAILABLE:
         return text, None
     
-    if not text or not text.strip():
+    # isspace() answers the blank check without copying text the way strip() does
+    if not text or text.isspace():
         return text, None
     
     try:
-        if translator is None:
-            translator = GoogleTranslator(source='auto', target='en')
-        
-        # Check if text contains non-ASCII characters (likely non-English)
-        has_non_ascii = any(ord(c) > 127 for c in text)
+        # Check if text contains non-ASCII characters (likely non-English); str.isascii()
+        # reads a flag CPython sets when the string is built, so this is O(1) at any size
+        has_non_ascii = not text.isascii()
         
         if not has_non_ascii:
             # Text appears to be all ASCII (likely English)
             return text, 'en'
         
+        # One translator is reused for the whole text and every word fallback
+        if translator is None:
+            translator = _get_translator()
+        
         # Text contains non-ASCII characters, needs translation
         # Try translating the whole text first
         try:
@@ -326,47 +535,12 @@ def translate_to_english(text, translator=None):
             
             # If translation returned the same text, try translating word by word for mixed content
             if translated_text == text or (len(translated_text) - len(text)) < 2:
-                # Split into words and translate non-ASCII words
-                import re
-                words = re.findall(r'\S+|\s+', text)  # Split preserving spaces
-                translated_words = []
-                
-                for word in words:
-                    if word.isspace():
-                        translated_words.append(word)
-                    elif any(ord(c) > 127 for c in word):
-                        # Word contains non-ASCII, translate it
-                        try:
-                            translated_word = GoogleTranslator(source='auto', target='en').translate(word)
-                            translated_words.append(translated_word)
-                        except:
-                            translated_words.append(word)
-                    else:
-                        # ASCII word, keep as is
-                        translated_words.append(word)
-                
-                translated_text = ''.join(translated_words)
+                translated_text = _translate_non_ascii_words(text, translator)
             
             return translated_text, 'auto'
         except Exception as e:
             # If bulk translation fails, try word-by-word
-            import re
-            words = re.findall(r'\S+|\s+', text)
-            translated_words = []
-            
-            for word in words:
-                if word.isspace():
-                    translated_words.append(word)
-                elif any(ord(c) > 127 for c in word):
-                    try:
-                        translated_word = GoogleTranslator(source='auto', target='en').translate(word)
-                        translated_words.append(translated_word)
-                    except:
-                        translated_words.append(word)
-                else:
-                    translated_words.append(word)
-            
-            return ''.join(translated_words), 'auto'
+            return _translate_non_ascii_words(text, translator), 'auto'
             
     except Exception as e:
         print(f"⚠️  Translation warning: {str(e)}")
@@ -379,38 +553,54 @@ def translate_transcript_data(transcript_data):
         print("⚠️  Translation not available. Install deep-translator for English output.")
         return transcript_data
     
-    translator = GoogleTranslator(source='auto', target='en')
+    original_transcript = transcript_data.get("transcript", "")
+    
+    # Collect sentence (paragraphs) and segment (Whisper) items that need translating
+    jobs = []
+    if "paragraphs" in transcript_data and transcript_data["paragraphs"]:
+        for para in transcript_data["paragraphs"]:
+            if isinstance(para, dict) and "sentences" in para:
+                for sent in para["sentences"]:
+                    if isinstance(sent, dict) and "text" in sent:
+                        jobs.append(sent)
+    
+    if "segments" in transcript_data and transcript_data["segments"]:
+        for seg in transcript_data["segments"]:
+            if isinstance(seg, dict) and "text" in seg:
+                jobs.append(seg)
+    
+    # All-ASCII (English) transcripts need no translator, thread pool or network calls
+    if original_transcript.isascii() and all((item["text"] or "").isascii() for item in jobs):
+        if original_transcript:
+            transcript_data["transcript_original"] = original_transcript
+            transcript_data["source_language"] = 'en' if original_transcript.strip() else None
+        for item in jobs:
+            item["text_original"] = item["text"]
+        print("🌐 Transcript is already in English, skipping translation")
+        return transcript_data
     
     # Translate main transcript
-    original_transcript = transcript_data.get("transcript", "")
     if original_transcript:
-        translated_transcript, source_lang = translate_to_english(original_transcript, translator)
+        translated_transcript, source_lang = translate_to_english(original_transcript)
         transcript_data["transcript_original"] = original_transcript
         transcript_data["transcript"] = translated_transcript
         transcript_data["source_language"] = source_lang
         print(f"🌐 Translated transcript from {source_lang} to English")
     
-    # Translate paragraphs if they exist
-    if "paragraphs" in transcript_data and transcript_data["paragraphs"]:
-        for para in transcript_data["paragraphs"]:
-            if isinstance(para, dict):
-                # Translate sentences in paragraph
-                if "sentences" in para:
-                    for sent in para["sentences"]:
-                        if isinstance(sent, dict) and "text" in sent:
-                            original_text = sent["text"]
-                            translated_text, _ = translate_to_english(original_text, translator)
-                            sent["text_original"] = original_text
-                            sent["text"] = translated_text
-    
-    # Translate segments if they exist (for Whisper)
-    if "segments" in transcript_data and transcript_data["segments"]:
-        for seg in transcript_data["segments"]:
-            if isinstance(seg, dict) and "text" in seg:
-                original_text = seg["text"]
-                translated_text, _ = translate_to_english(original_text, translator)
-                seg["text_original"] = original_text
-                seg["text"] = translated_text
+    if jobs:
+        # Speaker labels, greetings and interjections repeat a lot - translate each unique string once
+        unique_texts = list(dict.fromkeys(item["text"] for item in jobs))
+        
+        # Each translation is an independent network call, so run them concurrently
+        # (each worker thread uses its own translator)
+        with ThreadPoolExecutor(max_workers=min(10, len(unique_texts))) as executor:
+            results = executor.map(lambda text: translate_to_english(text)[0], unique_texts)
+            translations = dict(zip(unique_texts, results))
+        
+        for item in jobs:
+            original_text = item["text"]
+            item["text_original"] = original_text
+            item["text"] = translations[original_text]
     
     return transcript_data
 
@@ -424,36 +614,47 @@ def save_transcript(transcript_data, audio_path, output_dir="transcripts", trans
         print("\n🌐 Translating transcript to English...")
         transcript_data = translate_transcript_data(transcript_data)
     
-    # Create output filename
+    # Create output filename; one clock read so the filename and header agree
     audio_name = Path(audio_path).stem
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     service_name = transcript_data.get("service", "unknown")
     
     # Save as JSON (includes both original and translated)
-    json_path = os.path.join(output_dir, f"{audio_name}_{service_name}_{timestamp}.json")
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(transcript_data, f, indent=2, ensure_ascii=False)
+    base_path = os.path.join(output_dir, f"{audio_name}_{service_name}_{timestamp}")
+    json_path = base_path + ".json"
+    if ORJSON_AVAILABLE:
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(transcript_data, option=orjson.OPT_INDENT_2))
+    else:
+        # Encode once and write bytes, skipping the text layer's incremental encoder
+        with open(json_path, 'wb') as f:
+            f.write(json.dumps(transcript_data, indent=2, ensure_ascii=False).encode('utf-8'))
+    
+    # Save as text (English version), built up in memory and written once
+    txt_path = base_path + ".txt"
+    parts = [
+        f"Transcription Service: {service_name}\n",
+        f"Detected Language: {transcript_data.get('detected_language', 'unknown')}\n",
+    ]
+    if translate and transcript_data.get('source_language'):
+        parts.append(f"Source Language: {transcript_data.get('source_language')}\n")
+        parts.append(f"Translated to: English\n")
+    parts.append(f"Timestamp: {now.isoformat()}\n")
+    parts.append("\n" + "="*50 + "\n\n")
+    parts.append("TRANSCRIPT (English):\n")
+    parts.append("-" * 50 + "\n")
+    parts.append(transcript_data["transcript"])
+    
+    # Also include original if it exists and is different
+    if translate and transcript_data.get("transcript_original") and transcript_data["transcript_original"] != transcript_data["transcript"]:
+        parts.append("\n\n" + "="*50 + "\n")
+        parts.append("ORIGINAL TRANSCRIPT:\n")
+        parts.append("-" * 50 + "\n")
+        parts.append(transcript_data["transcript_original"])
     
-    # Save as text (English version)
-    txt_path = os.path.join(output_dir, f"{audio_name}_{service_name}_{timestamp}.txt")
     with open(txt_path, 'w', encoding='utf-8') as f:
-        f.write(f"Transcription Service: {service_name}\n")
-        f.write(f"Detected Language: {transcript_data.get('detected_language', 'unknown')}\n")
-        if translate and transcript_data.get('source_language'):
-            f.write(f"Source Language: {transcript_data.get('source_language')}\n")
-            f.write(f"Translated to: English\n")
-        f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-        f.write("\n" + "="*50 + "\n\n")
-        f.write("TRANSCRIPT (English):\n")
-        f.write("-" * 50 + "\n")
-        f.write(transcript_data["transcript"])
-        
-        # Also include original if it exists and is different
-        if translate and transcript_data.get("transcript_original") and transcript_data["transcript_original"] != transcript_data["transcript"]:
-            f.write("\n\n" + "="*50 + "\n")
-            f.write("ORIGINAL TRANSCRIPT:\n")
-            f.write("-" * 50 + "\n")
-            f.write(transcript_data["transcript_original"])
+        f.write("".join(parts))
     
     print(f"\n💾 Transcript saved:")
     print(f"   JSON: {json_path}")
@@ -2,6 +2,7 @@
 import os
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,19 +11,31 @@ ASSISTANT_ID = "2bcea4a9-6a61-488d-869c-fbda1e63af16" # Rainbow Scooty
 API_KEY = os.environ.get("VAPI_PRIVATE_KEY")
 HEADERS = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
 
-def update_to_rachel():
-    print(f"Updating Assistant {ASSISTANT_ID} to Rachel (American Female)...")
-    url = f"https://api.vapi.ai/assistant/{ASSISTANT_ID}"
-    
-    # Rachel Voice ID
+# Shared session so repeated updates reuse the pooled TLS connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+
+def update_voice(assistant_id, voice_id):
+    """PATCH an assistant's 11labs voice, returning the response"""
+    url = f"https://api.vapi.ai/assistant/{assistant_id}"
     payload = {
         "voice": {
             "provider": "11labs",
-            "voiceId": "21m00Tcm4TlvDq8ikWAM" 
+            "voiceId": voice_id
         }
     }
-    
-    resp = requests.patch(url, json=payload, headers=HEADERS)
+    return SESSION.patch(url, json=payload)
+
+def update_voices(assignments, max_workers=8):
+    """Update several assistants concurrently; assignments is [(assistant_id, voice_id), ...]"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda a: update_voice(*a), assignments))
+
+def update_to_rachel():
+    print(f"Updating Assistant {ASSISTANT_ID} to Rachel (American Female)...")
+
+    # Rachel Voice ID
+    resp = update_voice(ASSISTANT_ID, "21m00Tcm4TlvDq8ikWAM")
     if resp.status_code == 200:
         print("✅ Successfully updated to Rachel.")
     else:
@@ -9,16 +9,14 @@ def delete_lead():
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
-        # Check if exists
-        cursor.execute("SELECT * FROM conversations WHERE customer_phone = ?", (PHONE_TO_DELETE,))
-        if not cursor.fetchone():
+        # Delete directly; rowcount tells us whether the lead existed
+        cursor.execute("DELETE FROM conversations WHERE customer_phone = ?", (PHONE_TO_DELETE,))
+        conn.commit()
+        if cursor.rowcount == 0:
             print(f"Lead {PHONE_TO_DELETE} not found.")
             return
 
-        # Delete
-        cursor.execute("DELETE FROM conversations WHERE customer_phone = ?", (PHONE_TO_DELETE,))
-        conn.commit()
-        print(f"✅ Successfully deleted lead: {PHONE_TO_DELETE}")
+        print(f"✅ Successfully deleted lead: {PHONE_TO_DELETE} ({cursor.rowcount} conversations)")
         
     except Exception as e:
         print(f"❌ Error deleting lead: {e}")